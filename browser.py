@@ -12,6 +12,8 @@
 # browser.scroll_to: [selector] — scrolls to the element
 # browser.scroll_by: [x, y] — scrolls by a pixel amount
 # browser.press_key: [key] — simulates a keyboard key press
+# browser.perform_actions: [steps] — performs a batch of pointer/key actions in one round trip
+# browser.harvest: [selector, container, key, max_items, idle_ms, timeout_ms] — scrolls until no new items load and returns unique matching items
 # browser.element_exists: [selector] — returns whether the selector matches any element
 # browser.get_text: [selector] — returns inner text of the element
 # browser.get_all_text: [] — returns all visible text on the page
@@ -34,6 +36,8 @@
 # browser.sleep: [seconds] — pauses execution for N seconds
 # browser.screenshot: [] — takes a full-page screenshot (base64 or path)
 # browser.element_screenshot: [selector] — screenshots a specific element
+# browser.memory_stats: [] — returns rss of the browser process tree and js heap usage
+# browser.recycle: [relaunch] — reopens the current page in a fresh tab or a relaunched browser
 
 # network.list_requests: [] — returns a list of all captured network requests
 # network.get_request: [request_id] — returns full info for a specific request
@@ -41,31 +45,36 @@
 # network.get_response: [request_id] — returns response headers, status, body, etc.
 # network.get_response_body: [request_id] — returns the raw body of a specific response
 # network.get_all_headers: [request_id] — returns all request and response headers
-# network.search_requests: [url_pattern] — returns requests matching a URL substring or regex
+# network.search_requests: [url_pattern, regex, limit, offset] — returns requests matching a URL substring or regex
 # network.filter_by_method: [method] — returns requests using the specified HTTP method (e.g. GET, POST)
 # network.filter_by_status: [status_code] — returns responses with the given HTTP status
-# network.find_json_responses: [] — returns all responses with \`Content-Type: application/json\`
+# network.find_json_responses: [limit, offset] — returns all responses with \`Content-Type: application/json\`
 # network.find_errors: [] — returns all failed requests (4xx/5xx)
 # network.find_redirects: [] — returns all 3xx response requests
 # network.get_query_params: [request_id] — extracts query parameters from a URL
 # network.get_post_data: [request_id] — returns POST form or JSON body (if captured)
 # network.get_json_body: [request_id] — parses request or response as JSON
 # network.find_requests_to_domain: [domain] — returns all requests sent to a specific domain
-# network.find_requests_containing: [text] — returns requests/responses containing specific string in body
+# network.find_requests_containing: [text, limit, offset] — returns requests/responses containing specific string in the url or headers
 # network.get_timing: [request_id] — returns timing info (start time, duration, etc.)
 # network.get_size: [request_id] — returns request and response size (headers + body)
 # network.get_mime_type: [request_id] — returns the MIME type of the response
 # network.get_cookies: [request_id] — extracts `Set-Cookie` or sent cookies from headers
 
+import functools
 import inspect
+import json
 import re
+import threading
+import time
+from collections import OrderedDict
 from enum import Enum
 from typing import get_origin, get_args, Union, List, Dict
 
 import docstring_parser
 from fastmcp import FastMCP
 from selenium import webdriver
-from selenium.webdriver.common.actions.pointer_actions import PointerActions
+from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys as SeleniumKeys
 from selenium.webdriver.edge.options import Options
@@ -76,18 +85,216 @@ from selenium.webdriver.support import expected_conditions
 from selenium.webdriver.support.select import Select
 from selenium.webdriver.support.ui import WebDriverWait
 from webdriver_manager.microsoft import EdgeChromiumDriverManager
-from selenium.webdriver.common.bidi.network import Request
+from selenium.webdriver.common.bidi.network import NetworkEvent, Request
+from selenium.webdriver.common.bidi.session import session_subscribe
+
+try:
+    import psutil
+except ImportError:
+    # rss tracking is optional, js heap stats still work without it
+    psutil = None
 
 def toolcall(func):
     """Decorator to mark methods as tool calls."""
     func._is_toolcall = True
     return func
 
+TOKEN = re.compile(r"[a-z0-9]+")
+# partial tokens are looked up through trigrams of the vocabulary, shorter ones can't narrow anything
+GRAM = 3
+MAX_PATTERNS = 256
+
+
+@functools.lru_cache(maxsize=MAX_PATTERNS)
+def compile_pattern(pattern: str) -> re.Pattern:
+    return re.compile(pattern, re.IGNORECASE)
+
+
+def header_items(headers) -> List[tuple]:
+    # bidi headers are [{'name': ..., 'value': {'type': 'string', 'value': ...}}], plain dicts are also accepted
+    if not headers:
+        return []
+    if isinstance(headers, dict):
+        return [(str(k), str(v)) for k, v in headers.items()]
+
+    items = []
+    for header in headers:
+        value = header.get('value')
+        if isinstance(value, dict):
+            value = value.get('value', '')
+        items.append((str(header.get('name', '')), str(value)))
+    return items
+
+
+def grams(token: str) -> set:
+    return {token[i:i + GRAM] for i in range(len(token) - GRAM + 1)}
+
+
+class RequestIndex:
+    """
+    incremental inverted index over captured requests.
+    every request gets a doc id in capture order, tokens from its url and header values
+    map to the set of doc ids containing them. each field also maps trigrams to the
+    tokens containing them, so partial tokens at the edges of a query don't scan the vocabulary.
+    """
+    URL, HEADERS = 0, 1
+    WEIGHTS = (2, 1)
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.docs: List[Dict] = []
+        self.ids: Dict[str, int] = {}
+        self.postings: List[Dict[str, set]] = [{}, {}]
+        self.grams: List[Dict[str, set]] = [{}, {}]
+        self.json_docs: List[int] = []
+        # docs whose request headers are indexed, bidi callbacks run on their own threads so the
+        # response event can create the doc before before_request gets to it
+        self.request_headers: set = set()
+        # regex -> (docs scanned so far, matching doc ids), so repeated queries only scan new requests.
+        # bounded like compile_pattern, least recently used patterns are dropped first
+        self.regex_results: OrderedDict = OrderedDict()
+
+    def add_request(self, request_id: str, method: str = None, url: str = None, headers=None) -> int:
+        with self.lock:
+            return self._add_request(request_id, method, url, headers)
+
+    def _add_request(self, request_id, method, url, headers) -> int:
+        doc_id = self.ids.get(request_id)
+        if doc_id is None:
+            doc_id = self.ids[request_id] = len(self.docs)
+            self.docs.append({
+                'id': request_id,
+                'method': method,
+                'url': url or '',
+                'status': None,
+                'mime_type': None,
+                'text': ['', ''],
+            })
+            self.add_text(doc_id, self.URL, url)
+
+        if headers and doc_id not in self.request_headers:
+            self.request_headers.add(doc_id)
+            self.add_text(doc_id, self.HEADERS, " ".join(v for _, v in header_items(headers)))
+        return doc_id
+
+    def add_response(self, request_id: str, status: int = None, mime_type: str = None, headers=None,
+                     method: str = None, url: str = None, request_headers=None):
+        with self.lock:
+            # the request may have been missed (handler registered late), the response carries enough to index it
+            doc_id = self._add_request(request_id, method, url, request_headers)
+            doc = self.docs[doc_id]
+            doc['status'] = status
+
+            headers = header_items(headers)
+            if mime_type is None:
+                mime_type = next((v for n, v in headers if n.lower() == 'content-type'), None)
+            if mime_type:
+                was_json = (doc['mime_type'] or '').endswith('json')
+                doc['mime_type'] = mime_type.split(';')[0].strip().lower()
+                if doc['mime_type'].endswith('json') and not was_json:
+                    self.json_docs.append(doc_id)
+            self.add_text(doc_id, self.HEADERS, " ".join(v for _, v in headers))
+
+    def add_text(self, doc_id: int, field: int, text: str):
+        if not text:
+            return
+        text = text.lower()
+        doc = self.docs[doc_id]
+        doc['text'][field] = f"{doc['text'][field]}\n{text}" if doc['text'][field] else text
+
+        postings = self.postings[field]
+        for token in set(TOKEN.findall(text)):
+            ids = postings.get(token)
+            if ids is None:
+                ids = postings[token] = set()
+                for gram in grams(token):
+                    self.grams[field].setdefault(gram, set()).add(token)
+            ids.add(doc_id)
+
+    def partial(self, token: str, field: int):
+        """
+        doc ids with a token containing token, None when token is too short to narrow with trigrams.
+        """
+        if len(token) < GRAM:
+            return None
+
+        tokens = None
+        for gram in grams(token):
+            found = self.grams[field].get(gram, set())
+            tokens = found if tokens is None else tokens & found
+            if not tokens:
+                return set()
+
+        postings = self.postings[field]
+        docs = set()
+        for key in tokens:
+            if token in key:
+                docs |= postings[key]
+        return docs
+
+    def candidates(self, text: str, field: int) -> set:
+        """
+        doc ids that could contain text as a substring of field.
+        tokens fully inside the query must be whole tokens in the doc, the first and last one can be partial.
+        """
+        query = text.lower()
+        tokens = TOKEN.findall(query)
+        postings = self.postings[field]
+
+        result = None
+        for i, token in enumerate(tokens):
+            interior = ((i > 0 or not query.startswith(token)) and
+                        (i < len(tokens) - 1 or not query.endswith(token)))
+            docs = postings.get(token, set()) if interior else self.partial(token, field)
+            if docs is None:
+                continue
+            result = docs if result is None else result & docs
+            if not result:
+                return set()
+
+        # nothing could narrow the query (e.g. only 1-2 character tokens), every doc is checked
+        return set(range(len(self.docs))) if result is None else result
+
+    def search_text(self, text: str, fields=(URL, HEADERS)) -> List[int]:
+        with self.lock:
+            query = text.lower()
+            scores: Dict[int, int] = {}
+            for field in fields:
+                for doc_id in self.candidates(text, field):
+                    count = self.docs[doc_id]['text'][field].count(query)
+                    if count:
+                        scores[doc_id] = scores.get(doc_id, 0) + self.WEIGHTS[field] * min(count, 10)
+            # best score first, newest first on ties
+            return sorted(scores, key=lambda d: (-scores[d], -d))
+
+    def search_regex(self, pattern: str) -> List[int]:
+        compiled = compile_pattern(pattern)
+        with self.lock:
+            scanned, matches = self.regex_results.pop(pattern, (0, []))
+            for doc_id in range(scanned, len(self.docs)):
+                if compiled.search(self.docs[doc_id]['url']):
+                    matches.append(doc_id)
+            self.regex_results[pattern] = (len(self.docs), matches)
+            if len(self.regex_results) > MAX_PATTERNS:
+                self.regex_results.popitem(last=False)
+            return matches[::-1]
+
+    def page(self, doc_ids: List[int], limit: int, offset: int) -> List[Dict]:
+        if limit < 0 or offset < 0:
+            raise ValueError(f"limit and offset can't be negative, got limit={limit} offset={offset}")
+        selected = doc_ids[offset:offset + limit] if limit else doc_ids[offset:]
+        return [
+            {k: v for k, v in self.docs[doc_id].items() if k != 'text'}
+            for doc_id in selected
+        ]
+
+
 class NetworkHandler:
     # noinspection PyTypeChecker
     def __init__(self):
         self._driver: WebDriver = None
         self.requests = set()
+        self.index = RequestIndex()
 
     @property
     def driver(self):
@@ -98,15 +305,78 @@ class NetworkHandler:
         self._driver = value
         # this is causing errors, fix in later versions
         self._driver.network.add_request_handler('before_request', self.before_request, None, None)
+        # responseCompleted isn't an intercept phase, so add_request_handler can't take it,
+        # subscribe to the bidi event directly, it only observes and never blocks the response
+        network = self._driver.network
+        network.conn.add_callback(NetworkEvent("network.responseCompleted"), self.response_completed)
+        network.conn.execute(session_subscribe("network.responseCompleted"))
 
 
     def before_request(self, req: Request):
         self.requests.add(req)
+        if req.request_id:
+            self.index.add_request(str(req.request_id), req.method, req.url, req.headers)
+
+    def response_completed(self, event: NetworkEvent):
+        request = event.params.get('request', {})
+        response = event.params.get('response', {})
+        if not request.get('request'):
+            return
+        self.index.add_response(
+            str(request['request']),
+            status=response.get('status'),
+            mime_type=response.get('mimeType'),
+            headers=response.get('headers'),
+            method=request.get('method'),
+            url=request.get('url') or response.get('url'),
+            request_headers=request.get('headers'),
+        )
 
     @toolcall
     def list_requests(self) -> set[Request]:
         return self.requests.copy()
 
+    @toolcall
+    def search_requests(self, url_pattern: str, regex: bool, limit: int, offset: int) -> List[Dict]:
+        """
+        returns requests matching a URL substring or regex, newest first for regex, best match first for substrings.
+        :param url_pattern: substring or regex to look for in the URL.
+        :param regex: True to treat url_pattern as a regex.
+        :param limit: max number of results, 0 for no limit.
+        :param offset: number of results to skip.
+        :return: List[Dict]
+        """
+        if regex:
+            doc_ids = self.index.search_regex(url_pattern)
+        else:
+            doc_ids = self.index.search_text(url_pattern, (RequestIndex.URL,))
+        return self.index.page(doc_ids, limit, offset)
+
+    @toolcall
+    def find_requests_containing(self, text: str, limit: int, offset: int) -> List[Dict]:
+        """
+        returns requests/responses containing specific string in the url or request/response headers, best match first.
+        bodies aren't part of bidi network events so they aren't searched.
+        :param text: the string to look for, case insensitive.
+        :param limit: max number of results, 0 for no limit.
+        :param offset: number of results to skip.
+        :return: List[Dict]
+        """
+        doc_ids = self.index.search_text(text, (RequestIndex.URL, RequestIndex.HEADERS))
+        return self.index.page(doc_ids, limit, offset)
+
+    @toolcall
+    def find_json_responses(self, limit: int, offset: int) -> List[Dict]:
+        """
+        returns all responses with a JSON Content-Type, newest first.
+        :param limit: max number of results, 0 for no limit.
+        :param offset: number of results to skip.
+        :return: List[Dict]
+        """
+        with self.index.lock:
+            doc_ids = self.index.json_docs[::-1]
+        return self.index.page(doc_ids, limit, offset)
+
 
 # could execute js instead that sends a key press event
 # use mozilla docs for the key ids etc
@@ -192,21 +462,51 @@ class Keys(Enum):
 
 class BrowserHandler:
     # noinspection PyTypeChecker
-    def __init__(self, headless: bool = False):
+    def __init__(self, headless: bool = False,
+                 max_rss_mb: int = 4096,
+                 max_js_heap_mb: int = 1024,
+                 max_navigations: int = 500,
+                 memory_check_interval: int = 60):
+        self.headless = headless
+        # resolved once, relaunching during recovery shouldn't hit the network
+        self.driver_path = EdgeChromiumDriverManager(url = "https://msedgedriver.microsoft.com",
+            latest_release_url = "https://msedgedriver.microsoft.com/LATEST_RELEASE",).install()
+        self.driver = self._launch()
+
+        self._network: NetworkHandler = None
+
+        # memory governor, checked at the end of every tool that navigates or changes the page
+        # (navigation, pointer/keyboard input, form tools, scrolling, harvest) but not read-only
+        # tools, always in the calling thread so it never races a tool call
+        self.max_rss_mb = max_rss_mb
+        self.max_js_heap_mb = max_js_heap_mb
+        self.max_navigations = max_navigations
+        self.memory_check_interval = memory_check_interval
+        self.navigations = 0
+        self.recycles = 0
+        self._last_memory_check = time.monotonic()
+
+    def _launch(self) -> WebDriver:
         options = Options()
-        if headless:
+        if self.headless:
             options.add_argument("--headless=new")
         options.add_argument("--start-maximized")
         options.add_argument("--disable-blink-features=AutomationControlled")
 
-        self.driver = webdriver.Edge(
-            service=Service(EdgeChromiumDriverManager(url = "https://msedgedriver.microsoft.com",
-            latest_release_url = "https://msedgedriver.microsoft.com/LATEST_RELEASE",).install()),
+        driver = webdriver.Edge(
+            service=Service(self.driver_path),
             options=options
         )
+        self.enable_metrics(driver)
+        return driver
 
-        self.pointer = PointerActions()
-        self._network: NetworkHandler = None
+    @staticmethod
+    def enable_metrics(driver: WebDriver):
+        # Performance.getMetrics returns an empty list until the domain is enabled for the target
+        try:
+            driver.execute_cdp_cmd("Performance.enable", {})
+        except Exception:
+            pass
 
     @property
     def network(self):
@@ -228,6 +528,8 @@ class BrowserHandler:
         self.wait().until(
             lambda d: d.execute_script("return document.readyState") == "complete"
         )
+        self.navigations += 1
+        self.govern_memory()
 
     @toolcall
     def reload(self):
@@ -236,6 +538,8 @@ class BrowserHandler:
         :return: None
         """
         self.driver.refresh()
+        self.navigations += 1
+        self.govern_memory()
 
     @toolcall
     def go_back(self):
@@ -244,6 +548,8 @@ class BrowserHandler:
         :return: None
         """
         self.driver.back()
+        self.navigations += 1
+        self.govern_memory()
 
     @toolcall
     def go_forward(self):
@@ -252,6 +558,8 @@ class BrowserHandler:
         :return: None
         """
         self.driver.forward()
+        self.navigations += 1
+        self.govern_memory()
 
     @toolcall
     def click(self, selector: str):
@@ -260,7 +568,8 @@ class BrowserHandler:
         :param selector: CSS selector for the target element.
         :return: None
         """
-        self.pointer.click(self.find(selector))
+        self.actions().click(self.find(selector)).perform()
+        self.govern_memory()
 
     @toolcall
     def double_click(self, selector: str):
@@ -269,7 +578,8 @@ class BrowserHandler:
         :param selector: CSS selector for the target element.
         :return: None
         """
-        self.pointer.double_click(self.find(selector))
+        self.actions().double_click(self.find(selector)).perform()
+        self.govern_memory()
 
     @toolcall
     def right_click(self, selector: str):
@@ -278,7 +588,8 @@ class BrowserHandler:
         :param selector: CSS selector for the target element.
         :return: None
         """
-        self.pointer.context_click(self.find(selector))
+        self.actions().context_click(self.find(selector)).perform()
+        self.govern_memory()
 
     @toolcall
     def input_text(self, selector: str, text: str):
@@ -289,6 +600,7 @@ class BrowserHandler:
         :return: None
         """
         self.find(selector).send_keys(text)
+        self.govern_memory()
 
     @toolcall
     def input_clear(self, selector: str):
@@ -298,6 +610,7 @@ class BrowserHandler:
         :return: None
         """
         self.find(selector).clear()
+        self.govern_memory()
 
     @toolcall
     def submit(self, selector: str):
@@ -307,6 +620,7 @@ class BrowserHandler:
         :return: None
         """
         self.find(selector).submit()
+        self.govern_memory()
 
     @toolcall
     def hover(self, selector: str):
@@ -315,7 +629,8 @@ class BrowserHandler:
         :param selector: CSS selector for the target element.
         :return: None
         """
-        self.pointer.move_to(element=self.find(selector))
+        self.actions().move_to_element(self.find(selector)).perform()
+        self.govern_memory()
 
     @toolcall
     def scroll_to(self, selector: str):
@@ -325,6 +640,7 @@ class BrowserHandler:
         :return: None
         """
         self.driver.execute_script("arguments[0].scrollIntoView(true);", self.find(selector))
+        self.govern_memory()
 
     @toolcall
     def scroll_by(self, x: int, y: int):
@@ -335,6 +651,7 @@ class BrowserHandler:
         :return: None
         """
         self.driver.execute_script("window.scrollBy(arguments[0], arguments[1])", x, y)
+        self.govern_memory()
 
     @toolcall
     def press_key(self, selector: str, key: Keys):
@@ -344,7 +661,211 @@ class BrowserHandler:
         :param key: a key on the keyboard.
         :return: None
         """
-        self.find(selector).send_keys(key.value)
+        # send_keys_to_element would click first, focus instead so ESCAPE/ENTER don't activate the element
+        self.driver.execute_script("arguments[0].focus();", self.find(selector))
+        self.actions().send_keys(key.value).perform()
+        self.govern_memory()
+
+    @toolcall
+    def perform_actions(self, steps: str):
+        """
+        performs a sequence of pointer and keyboard actions in a single round trip (drag, chords, key sequences).
+        :param steps: JSON list of steps, each {"action": ..., ...}. actions: move_to [selector], move_by [x, y], click [selector?], double_click [selector?], right_click [selector?], click_and_hold [selector?], release [selector?], drag_and_drop [selector, target], key_down [key, selector?], key_up [key, selector?] (the selector is focused, not clicked), press [key], type [text], pause [seconds]. keys use the Keys names e.g. CONTROL.
+        :return: None
+        """
+        steps = json.loads(steps)
+        if isinstance(steps, dict):
+            steps = [steps]
+
+        required = {
+            'move_to': ('selector',),
+            'move_by': ('x', 'y'),
+            'click': (),
+            'double_click': (),
+            'right_click': (),
+            'click_and_hold': (),
+            'release': (),
+            'drag_and_drop': ('selector', 'target'),
+            'key_down': ('key',),
+            'key_up': ('key',),
+            'press': ('key',),
+            'type': ('text',),
+            'pause': ('seconds',),
+        }
+
+        keys = []
+        selectors = []
+        for i, step in enumerate(steps):
+            if not isinstance(step, dict):
+                raise ValueError(f"step {i}: expected an object, got {step!r}")
+            action = step.get('action')
+            if action not in required:
+                raise ValueError(f"step {i}: unknown action: {action}")
+            missing = [field for field in required[action] if step.get(field) in (None, '')]
+            if missing:
+                raise ValueError(f"step {i}: {action} requires {', '.join(missing)}")
+
+            key = step.get('key')
+            if key is not None:
+                if isinstance(key, str) and key in Keys.__members__:
+                    key = Keys[key].value
+                elif not (isinstance(key, str) and len(key) == 1):
+                    raise ValueError(f"step {i}: unknown key: {key!r}, use a Keys name or a single character")
+            keys.append(key)
+
+            for field in ('selector', 'target'):
+                if step.get(field) and step[field] not in selectors:
+                    selectors.append(step[field])
+        elements = dict(zip(selectors, self.find_many(selectors)))
+
+        chain = self.actions()
+        queued = False
+        for step, key in zip(steps, keys):
+            action = step['action']
+            element = elements.get(step.get('selector'))
+
+            if action in ('key_down', 'key_up') and element is not None:
+                # ActionChains would click the element first, focus it like press_key does instead.
+                # focus is a script call, so whatever is queued before it has to be sent first
+                if queued:
+                    chain.perform()
+                    chain = self.actions()
+                    queued = False
+                self.driver.execute_script("arguments[0].focus();", element)
+
+            if action == 'move_to':
+                chain.move_to_element(element)
+            elif action == 'move_by':
+                chain.move_by_offset(step['x'], step['y'])
+            elif action == 'click':
+                chain.click(element)
+            elif action == 'double_click':
+                chain.double_click(element)
+            elif action == 'right_click':
+                chain.context_click(element)
+            elif action == 'click_and_hold':
+                chain.click_and_hold(element)
+            elif action == 'release':
+                chain.release(element)
+            elif action == 'drag_and_drop':
+                chain.drag_and_drop(element, elements[step['target']])
+            elif action == 'key_down':
+                chain.key_down(key)
+            elif action == 'key_up':
+                chain.key_up(key)
+            elif action == 'press':
+                chain.key_down(key).key_up(key)
+            elif action == 'type':
+                chain.send_keys(step['text'])
+            elif action == 'pause':
+                chain.pause(step['seconds'])
+            queued = True
+
+        chain.perform()
+        self.govern_memory()
+
+    @toolcall
+    def harvest(self, selector: str, container: str, key: str, max_items: int, idle_ms: int, timeout_ms: int) -> List[Dict]:
+        """
+        scrolls a container or the window a viewport at a time until no new items load and returns each new item matching selector once.
+        :param selector: CSS selector for the items to collect.
+        :param container: CSS selector for the scrolling container, empty string for the window.
+        :param key: attribute used to de-duplicate items (e.g. href, data-id), empty string to use the item text.
+        :param max_items: stop after this many unique items, 0 for no limit.
+        :param idle_ms: stop when no new content has appeared for this many milliseconds.
+        :param timeout_ms: overall time budget in milliseconds.
+        :return: List[Dict]
+        """
+        # find raises like the other selector tools instead of silently using the window
+        element = self.find(container) if container else None
+
+        previous_timeout = self.driver.timeouts.script
+        self.driver.set_script_timeout(timeout_ms / 1000 + 5)
+        try:
+            items = self.driver.execute_async_script("""
+            const [selector, container, keyAttr, maxItems, idleMs, timeoutMs, done] = arguments;
+            const root = container || document.body;
+            const seen = new Set();
+            const items = [];
+            const deadline = Date.now() + timeoutMs;
+
+            // virtualized lists recycle their rows, so the key set is what prevents duplicates
+            const collect = () => {
+              let added = 0;
+              for (const el of root.querySelectorAll(selector)) {
+                const text = el.innerText.trim();
+                const key = keyAttr ? (el.getAttribute(keyAttr) || el[keyAttr] || text) : text;
+                if (!key || seen.has(key)) continue;
+                seen.add(key);
+                const item = {key: String(key), text: text};
+                if (el.href) item.href = el.href;
+                items.push(item);
+                added++;
+                if (maxItems && items.length >= maxItems) break;
+              }
+              return added;
+            };
+
+            const position = () => container ? container.scrollTop : window.scrollY;
+            const viewport = () => container ? container.clientHeight : window.innerHeight;
+
+            // one viewport at a time (with some overlap) so virtualized rows in between get rendered
+            const scroll = () => {
+              const before = position();
+              const top = Math.max(1, Math.floor(viewport() * 0.8));
+              (container || window).scrollBy({top: top, behavior: 'instant'});
+              return position() > before;
+            };
+
+            let idleTimer = null;
+            let stepTimer = null;
+            let stepDue = 0;
+            let finished = false;
+
+            const finish = () => {
+              if (finished) return;
+              finished = true;
+              observer.disconnect();
+              clearTimeout(idleTimer);
+              clearTimeout(stepTimer);
+              clearTimeout(deadlineTimer);
+              done(maxItems ? items.slice(0, maxItems) : items);
+            };
+
+            // keeps the earliest requested step, a mutation preempts the render fallback
+            const schedule = (ms) => {
+              if (finished || (stepTimer !== null && stepDue <= Date.now() + ms)) return;
+              clearTimeout(stepTimer);
+              stepDue = Date.now() + ms;
+              stepTimer = setTimeout(() => { stepTimer = null; step(); }, ms);
+            };
+
+            const step = () => {
+              if (finished) return;
+              const added = collect();
+              if ((maxItems && items.length >= maxItems) || Date.now() >= deadline) return finish();
+
+              if (scroll()) {
+                // still moving, step once the list renders the new rows or after a fallback for static pages
+                clearTimeout(idleTimer);
+                idleTimer = null;
+                schedule(100);
+              } else if (added || idleTimer === null) {
+                // at the end, wait for more content to load or stop once idle
+                clearTimeout(idleTimer);
+                idleTimer = setTimeout(finish, Math.min(idleMs, Math.max(0, deadline - Date.now())));
+              }
+            };
+
+            const observer = new MutationObserver(() => schedule(16));
+            const deadlineTimer = setTimeout(finish, timeoutMs);
+            observer.observe(root, {childList: true, subtree: true, characterData: true});
+            step();
+            """, selector, element, key, max_items, idle_ms, timeout_ms)
+        finally:
+            self.driver.set_script_timeout(previous_timeout)
+        self.govern_memory()
+        return items
 
     @toolcall
     def element_exists(self, selector: str) -> bool:
@@ -512,6 +1033,7 @@ class BrowserHandler:
                 if not opt.is_enabled():
                     continue
                 opt.click()
+        self.govern_memory()
 
     @toolcall
     def check(self, selector: str):
@@ -523,6 +1045,7 @@ class BrowserHandler:
         elm = self.find(selector)
         if not elm.is_selected():
             elm.click()
+        self.govern_memory()
 
     @toolcall
     def uncheck(self, selector: str):
@@ -534,6 +1057,7 @@ class BrowserHandler:
         elm = self.find(selector)
         if elm.is_selected():
             elm.click()
+        self.govern_memory()
 
     @toolcall
     def toggle(self, selector: str):
@@ -555,6 +1079,7 @@ class BrowserHandler:
         elm = self.find(selector)
         if state != elm.is_selected():
             elm.click()
+        self.govern_memory()
 
     @toolcall
     def wait_for(self, selector: str, timeout: int):
@@ -590,6 +1115,178 @@ class BrowserHandler:
                 expected_conditions.text_to_be_present_in_element((By.CSS_SELECTOR, selector), text)
             )
 
+    @toolcall
+    def memory_stats(self) -> Dict:
+        """
+        returns memory usage of the browser process tree and the current page.
+        :return: Dict
+        """
+        return self.sample_memory()
+
+    @toolcall
+    def recycle(self, relaunch: bool):
+        """
+        frees browser memory by reopening the current page in a fresh tab or a fresh browser.
+        :param relaunch: True to restart the whole browser, False to only replace the current tab.
+        :return: None
+        """
+        if relaunch:
+            self.relaunch_driver()
+        else:
+            self.recycle_tab()
+
+    def sample_memory(self) -> Dict:
+        stats = {
+            'rss_mb': None,
+            'js_heap_used_mb': None,
+            'js_heap_total_mb': None,
+            'processes': None,
+            'tabs': len(self.driver.window_handles),
+            'navigations': self.navigations,
+            'recycles': self.recycles,
+        }
+
+        if psutil is not None:
+            try:
+                root = psutil.Process(self.driver.service.process.pid)
+                procs = [root] + root.children(recursive=True)
+                rss = 0
+                for proc in procs:
+                    try:
+                        rss += proc.memory_info().rss
+                    except (psutil.NoSuchProcess, psutil.AccessDenied):
+                        pass
+                stats['rss_mb'] = rss / (1024 * 1024)
+                stats['processes'] = len(procs)
+            except (psutil.NoSuchProcess, psutil.AccessDenied, AttributeError):
+                pass
+
+        try:
+            metrics = self.driver.execute_cdp_cmd("Performance.getMetrics", {})['metrics']
+            metrics = {m['name']: m['value'] for m in metrics}
+        except Exception:
+            metrics = {}
+
+        if 'JSHeapUsedSize' in metrics:
+            stats['js_heap_used_mb'] = metrics['JSHeapUsedSize'] / (1024 * 1024)
+            stats['js_heap_total_mb'] = metrics.get('JSHeapTotalSize', metrics['JSHeapUsedSize']) / (1024 * 1024)
+        else:
+            # cdp unavailable or not enabled, fall back to the non standard performance.memory
+            heap = self.driver.execute_script(
+                "return performance.memory ? [performance.memory.usedJSHeapSize, performance.memory.totalJSHeapSize] : null"
+            )
+            if heap:
+                stats['js_heap_used_mb'] = heap[0] / (1024 * 1024)
+                stats['js_heap_total_mb'] = heap[1] / (1024 * 1024)
+
+        return stats
+
+    def govern_memory(self):
+        if self.max_navigations and self.navigations >= self.max_navigations:
+            self.relaunch_driver()
+            return
+
+        if time.monotonic() - self._last_memory_check < self.memory_check_interval:
+            return
+        self._last_memory_check = time.monotonic()
+
+        stats = self.sample_memory()
+        if stats['rss_mb'] is not None and stats['rss_mb'] > self.max_rss_mb:
+            self.relaunch_driver()
+        elif stats['js_heap_used_mb'] is not None and stats['js_heap_used_mb'] > self.max_js_heap_mb:
+            self.recycle_tab()
+
+    def recycle_tab(self):
+        old = self.driver.current_window_handle
+        url = self.driver.current_url
+        storage = self.get_storage()
+
+        # a new tab gets a new renderer, cookies are shared by the profile
+        self.driver.switch_to.new_window('tab')
+        new = self.driver.current_window_handle
+        self.driver.switch_to.window(old)
+        self.driver.close()
+        self.driver.switch_to.window(new)
+        self.enable_metrics(self.driver)
+
+        self.restore_page(url, storage)
+        self.recycles += 1
+
+    def relaunch_driver(self):
+        # the browser may already be dead, carry over whatever state can still be read
+        url = None
+        cookies = []
+        try:
+            url = self.driver.current_url
+        except Exception:
+            pass
+        storage = self.get_storage()
+        try:
+            cookies = self.driver.execute_cdp_cmd("Network.getAllCookies", {})['cookies']
+        except Exception:
+            try:
+                cookies = self.driver.get_cookies()
+            except Exception:
+                pass
+
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        self.driver = self._launch()
+        if self._network is not None:
+            self.network = self._network
+
+        if cookies:
+            try:
+                self.driver.execute_cdp_cmd("Network.setCookies", {'cookies': cookies})
+            except Exception:
+                # without cdp cookies can only be set for the current domain
+                if url:
+                    self.driver.get(url)
+                for cookie in cookies:
+                    try:
+                        self.driver.add_cookie(cookie)
+                    except Exception:
+                        pass
+
+        self.restore_page(url, storage)
+        self.navigations = 0
+        self.recycles += 1
+
+    def get_storage(self) -> Dict:
+        try:
+            return self.driver.execute_script("""
+            return {
+              local: Object.assign({}, window.localStorage),
+              session: Object.assign({}, window.sessionStorage)
+            };
+            """)
+        except Exception:
+            return {}
+
+    def restore_page(self, url: str, storage: Dict):
+        if not url or url.startswith(("about:", "data:", "edge:", "chrome:")):
+            return
+
+        self.driver.get(url)
+        if storage and (storage.get('local') or storage.get('session')):
+            # the first load may have redirected (e.g. to a login page on another origin),
+            # only write storage for url's origin and then load url itself again
+            restored = self.driver.execute_script("""
+            if (new URL(arguments[2]).origin !== location.origin) return false;
+            for (const [k, v] of Object.entries(arguments[0])) localStorage.setItem(k, v);
+            for (const [k, v] of Object.entries(arguments[1])) sessionStorage.setItem(k, v);
+            return true;
+            """, storage.get('local', {}), storage.get('session', {}), url)
+            if restored:
+                self.driver.get(url)
+
+        self.wait().until(
+            lambda d: d.execute_script("return document.readyState") == "complete"
+        )
+        self._last_memory_check = time.monotonic()
+
     def get_element_selector(self, element):
         return self.driver.execute_script("""  
           if (!(arguments[0] instanceof Element)) return null;
@@ -616,6 +1313,10 @@ class BrowserHandler:
           return parts.join(" > ");
         """, element)
 
+    def actions(self) -> ActionChains:
+        # bound per call since the driver can be relaunched by the memory governor
+        return ActionChains(self.driver)
+
     def wait(self, timeout: int = 10):
         return WebDriverWait(self.driver, timeout)
 
@@ -639,6 +1340,16 @@ class BrowserHandler:
         }
         return self.driver.find_elements(mapping.get(by, By.CSS_SELECTOR), selector)
 
+    def find_many(self, selectors: List[str]) -> List[WebElement]:
+        # resolves every selector in one script call instead of one find_element each
+        elements = self.driver.execute_script(
+            "return arguments[0].map(s => document.querySelector(s));", selectors
+        )
+        for selector, element in zip(selectors, elements):
+            if element is None:
+                self.find(selector)  # raises the usual NoSuchElementException
+        return elements
+
     def quit(self):
         self.driver.quit()
 
@@ -1,13 +1,34 @@
+import argparse
+
 from fastmcp import FastMCP
 from browser import toolcalls, BrowserHandler
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--headless", action="store_true")
+    # 0 keeps the browser in this process, N > 0 shards sessions over N worker processes
+    parser.add_argument("--workers", type=int, default=0)
+    # seconds a session can sit idle before its browser is closed, only used with --workers
+    parser.add_argument("--session-ttl", type=int, default=1800)
+    args = parser.parse_args()
+
     mcp = FastMCP()
-    browser = BrowserHandler(headless=False)
-    # network is still being made/fixed
-    #browser.network = NetworkHandler()
 
-    toolcalls(mcp, browser, "browser")
-    #toolcalls(mcp, browser.network, "browser.network")
+    if args.workers > 0:
+        from workers import WorkerPool
+
+        pool = WorkerPool(args.workers, session_ttl=args.session_ttl, headless=args.headless)
+        toolcalls(mcp, pool.proxy(BrowserHandler), "browser")
+        try:
+            mcp.run(transport="http")
+        finally:
+            pool.stop()
+    else:
+        browser = BrowserHandler(headless=args.headless)
+        # network is still being made/fixed
+        #browser.network = NetworkHandler()
+
+        toolcalls(mcp, browser, "browser")
+        #toolcalls(mcp, browser.network, "browser.network")
 
-    mcp.run(transport="http")
+        mcp.run(transport="http")
@@ -0,0 +1,313 @@
+import asyncio
+import functools
+import inspect
+import itertools
+import multiprocessing
+import pickle
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Connection
+from typing import Dict, List
+
+from browser import BrowserHandler
+
+# frames are pickled with protocol 5 and sent with send_bytes, which length prefixes
+# them so large results (get_html etc.) go over the pipe in one write
+PROTOCOL = 5
+
+# workers are started from a threaded front end (uvicorn, reader threads), forking it would
+# copy the listening socket, other workers' pipes and any locks held at the time into the child
+CONTEXT = multiprocessing.get_context("spawn")
+
+
+def send_frame(conn: Connection, lock: threading.Lock, message):
+    data = pickle.dumps(message, protocol=PROTOCOL)
+    with lock:
+        conn.send_bytes(data)
+
+
+def recv_frame(conn: Connection):
+    return pickle.loads(conn.recv_bytes())
+
+
+def worker_main(conn: Connection, handler_kwargs: Dict):
+    """
+    runs in a worker process, owns one BrowserHandler per session routed to it.
+    each session gets its own thread so a slow page in one session doesn't block the others.
+    messages are ("call", call_id, session, method, args, kwargs) or ("close", session).
+    """
+    handlers: Dict[str, BrowserHandler] = {}
+    executors: Dict[str, ThreadPoolExecutor] = {}
+    lock = threading.Lock()
+
+    def run(call_id, session, method, args, kwargs):
+        try:
+            handler = handlers.get(session)
+            if handler is None:
+                handler = handlers[session] = BrowserHandler(**handler_kwargs)
+            result = (True, getattr(handler, method)(*args, **kwargs))
+        except Exception as e:
+            # selenium exceptions don't always survive a pickle round trip
+            result = (False, RuntimeError(f"{type(e).__name__}: {e}"))
+
+        try:
+            send_frame(conn, lock, (call_id, *result))
+        except Exception as e:
+            # results that can't be pickled are reported instead of hanging the caller
+            send_frame(conn, lock, (call_id, False, RuntimeError(f"unpicklable result: {e}")))
+
+    def close(session):
+        handler = handlers.pop(session, None)
+        if handler is not None:
+            try:
+                handler.quit()
+            except Exception:
+                pass
+
+    try:
+        while True:
+            try:
+                message = recv_frame(conn)
+            except EOFError:
+                break
+            if message is None:
+                break
+
+            if message[0] == "close":
+                session = message[1]
+                executor = executors.pop(session, None)
+                if executor is not None:
+                    # queued behind any call still running for the session
+                    executor.submit(close, session)
+                    executor.shutdown(wait=False)
+                continue
+
+            _, call_id, session, method, args, kwargs = message
+            if session not in executors:
+                executors[session] = ThreadPoolExecutor(max_workers=1)
+            executors[session].submit(run, call_id, session, method, args, kwargs)
+    finally:
+        for executor in executors.values():
+            executor.shutdown(wait=True)
+        for handler in handlers.values():
+            try:
+                handler.quit()
+            except Exception:
+                pass
+
+
+def resolve(future: asyncio.Future, ok: bool, value):
+    # the caller may have gone away (cancelled) while the worker was busy
+    if future.done():
+        return
+    if ok:
+        future.set_result(value)
+    else:
+        future.set_exception(value)
+
+
+class Worker:
+    def __init__(self, handler_kwargs: Dict, on_exit=None):
+        self.conn, child = CONTEXT.Pipe()
+        self.process = CONTEXT.Process(target=worker_main, args=(child, handler_kwargs), daemon=True)
+        self.process.start()
+        child.close()
+
+        self.lock = threading.Lock()
+        self.pending_lock = threading.Lock()
+        self.pending: Dict[int, tuple] = {}
+        self.sessions = 0
+        self.alive = True
+        self.on_exit = on_exit
+
+        self.reader = threading.Thread(target=self.read, daemon=True)
+        self.reader.start()
+
+    def read(self):
+        while True:
+            try:
+                call_id, ok, value = recv_frame(self.conn)
+            except (EOFError, OSError):
+                break
+
+            with self.pending_lock:
+                future, loop = self.pending.pop(call_id)
+            loop.call_soon_threadsafe(resolve, future, ok, value)
+
+        with self.pending_lock:
+            self.alive = False
+            pending = list(self.pending.values())
+            self.pending.clear()
+        for future, loop in pending:
+            loop.call_soon_threadsafe(resolve, future, False, RuntimeError("browser worker exited"))
+
+        if self.on_exit is not None:
+            self.on_exit(self)
+
+    def call(self, call_id: int, session: str, method: str, args, kwargs) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self.pending_lock:
+            if not self.alive:
+                raise RuntimeError("browser worker exited")
+            self.pending[call_id] = (future, loop)
+        try:
+            send_frame(self.conn, self.lock, ("call", call_id, session, method, args, kwargs))
+        except OSError as e:
+            with self.pending_lock:
+                self.pending.pop(call_id, None)
+            raise RuntimeError(f"browser worker exited: {e}")
+        return future
+
+    def close(self, session: str):
+        try:
+            send_frame(self.conn, self.lock, ("close", session))
+        except OSError:
+            pass
+
+    def stop(self):
+        self.on_exit = None
+        try:
+            send_frame(self.conn, self.lock, None)
+        except OSError:
+            pass
+        self.process.join(timeout=30)
+
+
+class WorkerPool:
+    """
+    front end for browser workers running in separate processes.
+    sessions stick to the worker they were first routed to, new sessions go to the least loaded one.
+    sessions idle for longer than session_ttl seconds are closed along with their browser,
+    workers that die are replaced and the sessions they held start over on a fresh browser.
+    """
+    def __init__(self, workers: int, session_ttl: int = 1800, **handler_kwargs):
+        self.handler_kwargs = handler_kwargs
+        self.session_ttl = session_ttl
+        self.lock = threading.Lock()
+        self.workers: List[Worker] = [self.spawn() for _ in range(workers)]
+        self.routes: Dict[str, Worker] = {}
+        self.last_used: Dict[str, float] = {}
+        self.in_flight: Dict[str, int] = {}
+        self.ids = itertools.count()
+        self.stopping = threading.Event()
+
+        self.reaper = threading.Thread(target=self.reap, daemon=True)
+        self.reaper.start()
+
+    def spawn(self) -> Worker:
+        return Worker(self.handler_kwargs, on_exit=self.replace)
+
+    def replace(self, dead: Worker):
+        with self.lock:
+            if self.stopping.is_set() or dead not in self.workers:
+                return
+            for session in [s for s, w in self.routes.items() if w is dead]:
+                self.forget(session)
+
+        # starting a process is slow, don't hold up routing while it happens.
+        # the dead worker stays in the list until then, route() only picks it if nothing else is alive
+        worker = self.spawn()
+        with self.lock:
+            if not self.stopping.is_set():
+                # sessions routed to the dead worker while the replacement started
+                for session in [s for s, w in self.routes.items() if w is dead]:
+                    self.forget(session)
+                self.workers[self.workers.index(dead)] = worker
+                return
+        worker.stop()
+
+    def route(self, session: str) -> Worker:
+        with self.lock:
+            worker = self.routes.get(session)
+            if worker is not None and not worker.alive:
+                # its browser died with the worker, start over on a live one
+                self.forget(session)
+                worker = None
+            if worker is None:
+                worker = min(self.workers, key=lambda w: (not w.alive, w.sessions))
+                worker.sessions += 1
+                self.routes[session] = worker
+            self.last_used[session] = time.monotonic()
+            self.in_flight[session] = self.in_flight.get(session, 0) + 1
+            return worker
+
+    def forget(self, session: str):
+        # caller holds self.lock
+        worker = self.routes.pop(session, None)
+        if worker is not None:
+            worker.sessions -= 1
+        self.last_used.pop(session, None)
+        self.in_flight.pop(session, None)
+        return worker
+
+    def release(self, session: str, cutoff: float = None):
+        """
+        closes session and its browser, with a cutoff only if it is still idle since then.
+        """
+        with self.lock:
+            if cutoff is not None and (self.in_flight.get(session) or self.last_used.get(session, 0) >= cutoff):
+                return
+            worker = self.forget(session)
+        if worker is not None:
+            worker.close(session)
+
+    def reap(self):
+        while not self.stopping.wait(min(60, max(1, self.session_ttl / 4))):
+            cutoff = time.monotonic() - self.session_ttl
+            with self.lock:
+                idle = [s for s, t in self.last_used.items() if t < cutoff and not self.in_flight.get(s)]
+            for session in idle:
+                # checked again under the lock, a call may have routed to it since
+                self.release(session, cutoff)
+
+    async def call(self, session: str, method: str, *args, **kwargs):
+        worker = self.route(session)
+        try:
+            return await worker.call(next(self.ids), session, method, args, kwargs)
+        finally:
+            with self.lock:
+                if session in self.in_flight:
+                    self.in_flight[session] -= 1
+                    self.last_used[session] = time.monotonic()
+
+    def proxy(self, cls):
+        """
+        builds an object with the same toolcall methods as cls that forward to the workers,
+        so it can be passed straight to toolcalls().
+        """
+        proxy = types.SimpleNamespace()
+        for name, func in inspect.getmembers(cls, predicate=inspect.isfunction):
+            if getattr(func, "_is_toolcall", False):
+                setattr(proxy, name, types.MethodType(self.forward(name, func), proxy))
+        return proxy
+
+    def forward(self, name, func):
+        pool = self
+
+        @functools.wraps(func)
+        async def forwarded(_self, *args, **kwargs):
+            return await pool.call(current_session(), name, *args, **kwargs)
+
+        return forwarded
+
+    def stop(self):
+        self.stopping.set()
+        with self.lock:
+            workers = list(self.workers)
+        for worker in workers:
+            worker.stop()
+
+
+def current_session() -> str:
+    # routing everyone to a shared browser would leak state between clients, so refuse instead
+    from fastmcp.server.dependencies import get_context
+    try:
+        session_id = get_context().session_id
+    except RuntimeError as e:
+        raise RuntimeError(f"browser tools need an MCP session to route to a worker: {e}")
+    if not session_id:
+        raise RuntimeError("browser tools need an MCP session to route to a worker")
+    return session_id